@@ -1,9 +1,20 @@
 import os
+import re
+import sys
+import errno
+import time
 import shutil
 import logging
 import argparse
 from datetime import datetime
-from collections import defaultdict
+from itertools import groupby
+from operator import itemgetter
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, as_completed, wait
+
+# Scanning and moving are I/O-bound, so use more threads than cores.
+MAX_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+logger = logging.getLogger(__name__)
 
 def setup_logging(log_file=None):
     """Setup logging configuration."""
@@ -19,102 +30,185 @@ def setup_logging(log_file=None):
         handlers=handlers
     )
 
-def log(message, level='info'):
-    """Log a message with the given level."""
-    log_function = getattr(logging, level.lower(), logging.info)
-    log_function(message)
-
 def parse_config(config_file):
     """Parse the categories configuration file."""
     categories = {}
     ignore_paths = []
     with open(config_file, 'r') as file:
-        for line in file:
-            line = line.strip()
-            if line and not line.startswith("#"):
-                if ':' in line:
-                    folder, extensions = line.split(':')
-                    folder = folder.strip()
-                    extensions = [ext.strip() for ext in extensions.split(',')]
-                    if folder.lower() == "ignore":
-                        ignore_paths.extend(extensions)
-                    else:
-                        categories[folder] = extensions
-    log(f"Parsed categories: {categories}")
-    log(f"Parsed ignore paths: {ignore_paths}")
+        text = file.read()
+    for line in text.splitlines():
+        line = line.strip()
+        if line and not line.startswith("#"):
+            if ':' in line:
+                folder, extensions = line.split(':', 1)
+                folder = folder.strip()
+                extensions = [ext.strip() for ext in extensions.split(',')]
+                if folder.lower() == "ignore":
+                    ignore_paths.extend(extensions)
+                else:
+                    categories[folder] = extensions
+    logger.info("Parsed categories: %s", categories)
+    logger.info("Parsed ignore paths: %s", ignore_paths)
     return categories, ignore_paths
 
-def should_ignore(path, ignore_paths):
-    """Check if the file path should be ignored."""
-    for ignore in ignore_paths:
-        if ignore in path:
-            log(f"File {path} ignored due to pattern: {ignore}", level='warning')
-            return True
+def build_extension_map(categories):
+    """Invert the categories into an extension -> folder lookup."""
+    ext_to_folder = {}
+    for folder, extensions in categories.items():
+        for ext in extensions:
+            # The first category listing an extension wins, as with the old linear scan.
+            ext_to_folder.setdefault(ext.lower().lstrip('.'), folder)
+    return ext_to_folder
+
+def compile_ignore_patterns(ignore_paths):
+    """Compile the ignore substrings into a single regex, or None if there are none."""
+    if not ignore_paths:
+        return None
+    return re.compile("|".join(re.escape(ignore) for ignore in ignore_paths))
+
+def should_ignore(path, ignore_pattern, kind='File', pos=0):
+    """Check if the file path should be ignored, searching from index pos onwards."""
+    if ignore_pattern is None:
+        return False
+    match = ignore_pattern.search(path, pos)
+    if match:
+        logger.warning("%s %s ignored due to pattern: %s", kind, path, match.group(0))
+        return True
     return False
 
-def get_year_of_last_modified(file_path):
+def get_year_of_last_modified(file_path, st_mtime=None):
     """Get the year of the last modified date of the file."""
-    last_modified_time = os.path.getmtime(file_path)
-    year = datetime.fromtimestamp(last_modified_time).year
-    log(f"File {file_path} last modified in year: {year}")
+    last_modified_time = st_mtime if st_mtime is not None else os.path.getmtime(file_path)
+    year = time.localtime(last_modified_time).tm_year
+    logger.debug("File %s last modified in year: %s", file_path, year)
     return year
 
-def simulate_file_structure(base_dir, categories, ignore_paths):
-    """Simulate the file structure changes."""
-    simulated_structure = defaultdict(lambda: defaultdict(list))
-
-    for root, _, files in os.walk(base_dir):
-        for file in files:
-            file_ext = file.split('.')[-1].lower()
-            file_path = os.path.join(root, file)
+def _list_dir(path, ignore_pattern, longest_ignore):
+    """List one directory, returning its files and subdirectories that are not ignored.
+
+    path itself is known not to match, so a match in a child's path must end
+    past it and can start at most longest_ignore - 1 characters before its end.
+    """
+    files = []
+    subdirs = []
+    pos = max(0, len(path) - longest_ignore + 1)
+    try:
+        with os.scandir(path) as it:
+            for entry in it:
+                if entry.is_dir():
+                    if entry.is_symlink():
+                        continue
+                    if not should_ignore(entry.path, ignore_pattern, kind='Directory', pos=pos):
+                        subdirs.append(entry.path)
+                elif not should_ignore(entry.path, ignore_pattern, pos=pos):
+                    files.append(entry)
+    except OSError as e:
+        logger.warning("Could not scan directory %s: %s", path, e)
+    return files, subdirs
+
+def _scan_tree(base_dir, ignore_pattern=None, longest_ignore=0):
+    """Yield a DirEntry for every file under base_dir that is not ignored.
+
+    Subdirectories are listed concurrently on a thread pool. Directories whose
+    path matches ignore_pattern are pruned without being listed: every path
+    below them contains the same match.
+    """
+    if should_ignore(base_dir, ignore_pattern, kind='Directory'):
+        return
+
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        pending = {executor.submit(_list_dir, base_dir, ignore_pattern, longest_ignore)}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                files, subdirs = future.result()
+                for subdir in subdirs:
+                    pending.add(executor.submit(_list_dir, subdir, ignore_pattern, longest_ignore))
+                yield from files
+
+def _categorize_files(base_dir, categories, ignore_paths):
+    """Yield (entry, year, folder) for every file that belongs to a category."""
+    ext_to_folder = build_extension_map(categories)
+    ignore_pattern = compile_ignore_patterns(ignore_paths)
+    longest_ignore = max(map(len, ignore_paths), default=0)
+
+    for entry in _scan_tree(base_dir, ignore_pattern, longest_ignore):
+        _, dot, file_ext = entry.name.rpartition('.')
+        if not dot:
+            continue
+
+        folder = ext_to_folder.get(file_ext.lower())
+        if folder is None:
+            continue
+
+        st = entry.stat()
+        year = get_year_of_last_modified(entry.path, st.st_mtime)
+        yield entry, year, folder
 
-            if should_ignore(file_path, ignore_paths):
-                continue
-
-            year = get_year_of_last_modified(file_path)
-
-            for folder, extensions in categories.items():
-                if file_ext in extensions:
-                    simulated_structure[year][folder].append(file)
-                    break
-
-    return simulated_structure
+def simulate_file_structure(base_dir, categories, ignore_paths):
+    """Simulate the file structure changes, yielding (year, folder, file) as files are found."""
+    for entry, year, folder in _categorize_files(base_dir, categories, ignore_paths):
+        yield year, folder, entry.name
 
 def print_simulated_structure(base_dir, simulated_structure):
     """Print the simulated directory structure."""
-    print(base_dir)
-    for year, folders in sorted(simulated_structure.items(), reverse=True):
-        print(f"|-- {year}")
-        for folder, files in folders.items():
-            print(f"|   |-- {folder}")
-            for file in sorted(files):
-                print(f"|   |   |-- {file}")
+    buckets = {}
+    for year, folder, file in simulated_structure:
+        buckets.setdefault((year, folder), []).append(file)
+
+    # Two stable sorts with C-level keys: by folder, then by year descending.
+    keys = sorted(buckets, key=itemgetter(1))
+    keys.sort(key=itemgetter(0), reverse=True)
+
+    lines = [base_dir]
+    for year, year_keys in groupby(keys, key=itemgetter(0)):
+        lines.append(f"|-- {year}")
+        for key in year_keys:
+            lines.append(f"|   |-- {key[1]}")
+            lines.extend(f"|   |   |-- {file}" for file in sorted(buckets[key]))
+    sys.stdout.write("\n".join(lines) + "\n")
+
+def _fast_move(src, dst):
+    """Move a file with a single rename, falling back to shutil.move across filesystems."""
+    try:
+        os.replace(src, dst)
+    except OSError as e:
+        if e.errno != errno.EXDEV:
+            raise
+        shutil.move(src, dst)
+
+def _move_bucket(entries, dest_dir):
+    """Create dest_dir if needed and move every scanned file in entries into it."""
+    os.makedirs(dest_dir, exist_ok=True)
+    for entry in entries:
+        _fast_move(entry.path, os.path.join(dest_dir, entry.name))
 
 def organize_files(base_dir, categories, ignore_paths, test_mode=False):
     """Organize files into specified categories by year."""
-    for root, _, files in os.walk(base_dir):
-        for file in files:
-            file_ext = file.split('.')[-1].lower()
-            file_path = os.path.join(root, file)
-
-            if should_ignore(file_path, ignore_paths):
-                continue
-
-            year = get_year_of_last_modified(file_path)
-
-            for folder, extensions in categories.items():
-                if file_ext in extensions:
-                    dest_dir = os.path.join(base_dir, str(year), folder)
-                    if not os.path.exists(dest_dir):
-                        log(f"Creating directory: {dest_dir}")
-                        if not test_mode:
-                            os.makedirs(dest_dir)
-
-                    dest_file_path = os.path.join(dest_dir, file)
-                    log(f"Moving {file_path} to {dest_file_path}")
-                    if not test_mode:
-                        shutil.move(file_path, dest_file_path)
-                    break
+    buckets = {}
+    for entry, year, folder in _categorize_files(base_dir, categories, ignore_paths):
+        buckets.setdefault((year, folder), []).append(entry)
+
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        moves = {}
+        for (year, folder), entries in buckets.items():
+            dest_dir = os.path.join(base_dir, str(year), folder)
+            if not os.path.isdir(dest_dir):
+                logger.info("Creating directory: %s", dest_dir)
+            if test_mode:
+                for entry in entries:
+                    logger.info("Moving %s to %s", entry.path, os.path.join(dest_dir, entry.name))
+            else:
+                moves[executor.submit(_move_bucket, entries, dest_dir)] = (dest_dir, entries)
+
+        # Log once per bucket after it completes so the workers only issue renames.
+        for future in as_completed(moves):
+            future.result()
+            dest_dir, entries = moves[future]
+            logger.info("Moved %d files to %s", len(entries), dest_dir)
+            if logger.isEnabledFor(logging.DEBUG):
+                for entry in entries:
+                    logger.debug("Moved %s to %s", entry.path, dest_dir)
 
 def main():
     parser = argparse.ArgumentParser(description="Organize files by year and category.")
@@ -130,23 +224,23 @@ def main():
 
     setup_logging(LOG_FILE_BASE)
 
-    log(f"Starting file organization process for directory: {BASE_DIR}")
+    logger.info("Starting file organization process for directory: %s", BASE_DIR)
     test_mode = args.test
     simulate_mode = args.simulate
 
     if test_mode:
-        log("Running in test mode")
+        logger.info("Running in test mode")
 
     categories, ignore_paths = parse_config(CONFIG_FILE)
 
     if simulate_mode:
-        log("Simulating file organization")
+        logger.info("Simulating file organization")
         simulated_structure = simulate_file_structure(BASE_DIR, categories, ignore_paths)
         print_simulated_structure(BASE_DIR, simulated_structure)
     else:
         organize_files(BASE_DIR, categories, ignore_paths, test_mode)
 
-    log("File organization process completed")
+    logger.info("File organization process completed")
 
 if __name__ == "__main__":
     main()